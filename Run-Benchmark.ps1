@@ -31,7 +31,7 @@ Write-Host "============================================================`n" -For
 # Step 0: Install Python dependencies
 if (-not $SkipInstall) {
     Write-Host "[Step 0] Installing Python dependencies..." -ForegroundColor Yellow
-    pip install openpyxl pymupdf --quiet 2>$null
+    pip install openpyxl pymupdf numpy --quiet 2>$null
     if ($LASTEXITCODE -ne 0) {
         Write-Host "  WARNING: pip install had issues. Continuing anyway..." -ForegroundColor DarkYellow
     } else {
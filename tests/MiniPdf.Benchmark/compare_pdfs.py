@@ -9,18 +9,29 @@ Produces a detailed comparison report including:
 
 Prerequisites:
     pip install pymupdf   # for text extraction + rendering
+    pip install numpy     # for pixel comparison
+    pip install orjson    # optional, faster JSON report writing
 
 Usage:
     python compare_pdfs.py [--minipdf-dir ./minipdf_pdfs] [--reference-dir ./reference_pdfs] [--report-dir ./reports]
+                           [--save-diff-images] [--image-format {jpg,png}] [--diff-threshold 0.999]
+                           [--max-pages 20]
 """
 
 import argparse
 import difflib
+import hashlib
+import itertools
 import json
 import os
+import pickle
+import stat
 import sys
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from pathlib import Path
+
+import numpy as np
 
 # Try to import fitz (PyMuPDF) for text extraction and visual comparison
 try:
@@ -31,34 +42,55 @@ except ImportError:
     print("WARNING: PyMuPDF not installed. Install with: pip install pymupdf")
     print("         Text extraction and visual comparison will be disabled.\n")
 
+# Prefer orjson (C serializer) for the JSON report; fall back to the stdlib
+try:
+    import orjson
 
-def extract_text_pymupdf(pdf_path: str) -> list[str]:
-    """Extract text from each page using PyMuPDF.
-    Uses dict extraction for individual text spans, avoiding
-    false merging of adjacent table cells on the same line."""
-    pages = []
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        data = page.get_text("dict", sort=True)
-        spans = []
-        for block in data.get("blocks", []):
-            if block.get("type", 0) != 0:
-                continue
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    text = span.get("text", "").strip()
-                    if text:
-                        spans.append((round(span["bbox"][1], 1), span["bbox"][0], text))
-        # Sort by Y then X position
-        spans.sort()
-        page_text = "\n".join(s[2] for s in spans)
-        pages.append(page_text)
-    doc.close()
-    return pages
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+# Diff output lines kept per document (the report shows at most 3000 chars)
+MAX_DIFF_LINES = 2000
+
+# Pixel buffers larger than CHUNK_THRESHOLD bytes are compared CHUNK_BYTES at a time
+CHUNK_THRESHOLD = 4_000_000
+CHUNK_BYTES = 1 << 20
+
+# Bump when extraction or scoring changes so stale .cache.pkl entries are dropped
+CACHE_VERSION = 3
 
+# Token separating pages in the page-aware word sequence (and line in the diff)
+PAGE_BREAK = "---PAGE---"
 
-def extract_text_fallback(pdf_path: str) -> list[str]:
-    """Fallback: extract raw ASCII strings from PDF binary."""
+
+def _extract_text(doc) -> tuple[list[list[str]], list[list[str]]]:
+    """Extract the words and the text lines of each page of an already-open
+    PyMuPDF document. Uses word extraction, which skips the layout
+    reconstruction of the text modes and never merges adjacent table cells.
+    Words (sorted by Y then X) are used for scoring; lines, rebuilt from each
+    word's (block_no, line_no), are only used to display the diff."""
+    word_pages = []
+    line_pages = []
+    for page in doc:
+        # (x0, y0, x1, y1, word, block_no, line_no, word_no)
+        words = [(round(w[1], 1), w[0], w[4], w[5], w[6]) for w in page.get_text("words")]
+        # Sort by Y then X position
+        words.sort()
+        word_pages.append([w[2] for w in words])
+        # Lines appear in the order of their first word; words within a line by X
+        lines = {}
+        for _, x0, word, block_no, line_no in words:
+            lines.setdefault((block_no, line_no), []).append((x0, word))
+        line_pages.append([" ".join(word for _, word in sorted(ws)) for ws in lines.values()])
+    return word_pages, line_pages
+
+
+def extract_text_fallback(pdf_path: str) -> tuple[list[list[str]], list[list[str]]]:
+    """Fallback: extract raw ASCII strings from PDF binary as a single page
+    of words (and of lines, one per PDF string, for the diff)."""
     with open(pdf_path, "rb") as f:
         data = f.read()
     # Very rough extraction: find text between BT..ET operators
@@ -66,21 +98,29 @@ def extract_text_fallback(pdf_path: str) -> list[str]:
     # Extract parenthesized strings (PDF text objects)
     import re
     strings = re.findall(r"\(([^)]*)\)", text)
-    return ["\n".join(strings)]
+    return [" ".join(strings).split()], [[t for t in (s.strip() for s in strings) if t]]
 
 
-def render_page_to_pixels(pdf_path: str, page_num: int, dpi: int = 150):
-    """Render a PDF page to a pixel map using PyMuPDF. Returns (width, height, samples)."""
-    doc = fitz.open(pdf_path)
-    if page_num >= len(doc):
-        doc.close()
-        return None
-    page = doc[page_num]
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
-    pix = page.get_pixmap(matrix=mat, alpha=False)
-    result = (pix.width, pix.height, pix.samples)
-    doc.close()
-    return result
+def _render(doc, page_num: int, mat):
+    """Render one page of an open document to an RGB pixmap."""
+    return doc[page_num].get_pixmap(matrix=mat, alpha=False)
+
+
+def _count_equal(s1, s2, n: int) -> int:
+    """Count equal bytes among the first n bytes of two buffers.
+    Large buffers are compared in CHUNK_BYTES slices so the temporaries stay cache-sized."""
+    if n <= CHUNK_THRESHOLD:
+        a = np.frombuffer(s1, dtype=np.uint8, count=n)
+        b = np.frombuffer(s2, dtype=np.uint8, count=n)
+        return int(np.count_nonzero(a == b))
+
+    matching = 0
+    for off in range(0, n, CHUNK_BYTES):
+        count = min(CHUNK_BYTES, n - off)
+        a = np.frombuffer(s1, dtype=np.uint8, count=count, offset=off)
+        b = np.frombuffer(s2, dtype=np.uint8, count=count, offset=off)
+        matching += int(np.count_nonzero(a == b))
+    return matching
 
 
 def pixel_diff_score(pix1, pix2) -> float:
@@ -99,65 +139,196 @@ def pixel_diff_score(pix1, pix2) -> float:
         min_len = min(len(s1), len(s2))
         if min_len == 0:
             return 0.0
-        matching = sum(1 for a, b in zip(s1[:min_len], s2[:min_len]) if a == b)
-        return matching / min_len
+        return _count_equal(s1, s2, min_len) / min_len
 
     total = len(s1)
-    if total == 0:
+    if total == 0 or s1 == s2:
+        # Byte-identical renders (single memcmp) need no element-wise compare
         return 1.0
-    matching = sum(1 for a, b in zip(s1, s2) if a == b)
-    return matching / total
+    return _count_equal(s1, s2, total) / total
 
 
-def save_visual_diff(pdf1_path: str, pdf2_path: str, output_dir: str, name: str, dpi: int = 150):
-    """Save visual diff images for each page."""
-    if not HAS_FITZ:
-        return []
+def _token_ratio(ta: list[str], tb: list[str]) -> float:
+    """SequenceMatcher ratio over word tokens rather than characters,
+    which keeps the quadratic matcher on much shorter sequences."""
+    if ta == tb:
+        return 1.0
+    # Wildly different lengths can't score well; skip the diff entirely
+    length_ratio = min(len(ta), len(tb)) / max(len(ta), len(tb), 1)
+    if length_ratio < 0.3:
+        return length_ratio
+    return difflib.SequenceMatcher(None, ta, tb, autojunk=False).ratio()
 
-    diff_images = []
-    doc1 = fitz.open(pdf1_path)
-    doc2 = fitz.open(pdf2_path)
-    max_pages = max(len(doc1), len(doc2))
 
+def _score_pix(pix_a, pix_b) -> float:
+    """pixel_diff_score for two fitz.Pixmap objects (None = missing page)."""
+    if pix_a is None or pix_b is None:
+        return 0.0
+    return pixel_diff_score(
+        (pix_a.width, pix_a.height, pix_a.samples),
+        (pix_b.width, pix_b.height, pix_b.samples),
+    )
+
+
+def _save_pix(pix, path: str, image_format: str):
+    """Write a pixmap as PNG, or as a quality-75 JPEG (much cheaper to encode)."""
+    if image_format == "jpg":
+        with open(path, "wb") as f:
+            f.write(pix.tobytes("jpg", jpg_quality=75))
+    else:
+        pix.save(path)
+
+
+def _compare_pages(doc_m, doc_r, output_dir: str, name: str, save_images: bool = False,
+                   score_dpi: int = 72, image_dpi: int = 150, diff_threshold: float = 0.999,
+                   max_pages_cap: int | None = None, image_format: str = "jpg",
+                   save_all: bool = False):
+    """Render and score each page pair at score_dpi; when save_images is set,
+    pages scoring below diff_threshold (every page if save_all is set) are
+    also rendered at image_dpi and saved as image_format ("jpg" or "png") files.
+    Only the first max_pages_cap pages are visited (all if None).
+    Returns (visual_scores, diff_images)."""
+    visual_scores = []
+    diff_images = []
+    mat_score = fitz.Matrix(score_dpi / 72, score_dpi / 72)
+    mat_image = fitz.Matrix(image_dpi / 72, image_dpi / 72)
+    n_m = doc_m.page_count
+    n_r = doc_r.page_count
+    max_pages = max(n_m, n_r)
+    if max_pages_cap:
+        max_pages = min(max_pages, max_pages_cap)
+
+    # Renders stay sequential: PyMuPDF is not thread-safe and get_pixmap holds
+    # the GIL, so a thread pool here would risk crashes without any overlap.
+    # Parallelism comes from the per-pair ProcessPoolExecutor in main().
     for i in range(max_pages):
-        mat = fitz.Matrix(dpi / 72, dpi / 72)
+        pix_m = _render(doc_m, i, mat_score) if i < n_m else None
+        pix_r = _render(doc_r, i, mat_score) if i < n_r else None
+        score = _score_pix(pix_m, pix_r)
+        visual_scores.append(round(score, 4))
 
-        if i < len(doc1):
-            pix1 = doc1[i].get_pixmap(matrix=mat, alpha=False)
-        else:
-            pix1 = None
+        # Matching pages have nothing worth looking at; skip the image encoding
+        if not save_images or (score >= diff_threshold and not save_all):
+            continue
 
-        if i < len(doc2):
-            pix2 = doc2[i].get_pixmap(matrix=mat, alpha=False)
-        else:
-            pix2 = None
+        # The similarity ratio does not need full resolution; the images do
+        if image_dpi != score_dpi:
+            pix_m = _render(doc_m, i, mat_image) if i < n_m else None
+            pix_r = _render(doc_r, i, mat_image) if i < n_r else None
 
         # Save individual renderings
-        if pix1:
-            path1 = os.path.join(output_dir, f"{name}_p{i+1}_minipdf.png")
-            pix1.save(path1)
+        img_m = f"{name}_p{i+1}_minipdf.{image_format}"
+        img_r = f"{name}_p{i+1}_reference.{image_format}"
+        if pix_m:
+            _save_pix(pix_m, os.path.join(output_dir, img_m), image_format)
 
-        if pix2:
-            path2 = os.path.join(output_dir, f"{name}_p{i+1}_reference.png")
-            pix2.save(path2)
+        if pix_r:
+            _save_pix(pix_r, os.path.join(output_dir, img_r), image_format)
 
         diff_images.append({
             "page": i + 1,
-            "minipdf_img": f"{name}_p{i+1}_minipdf.png" if pix1 else None,
-            "reference_img": f"{name}_p{i+1}_reference.png" if pix2 else None,
+            "minipdf_img": img_m if pix_m else None,
+            "reference_img": img_r if pix_r else None,
         })
 
-    doc1.close()
-    doc2.close()
-    return diff_images
+    return visual_scores, diff_images
+
+
+def _stat_file(path: str) -> os.stat_result | None:
+    """Single stat call for a PDF; None if it is missing or not a regular file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _file_key(path: str, st: os.stat_result) -> tuple:
+    """Cache key for a PDF: changes whenever the file is regenerated."""
+    return (path, st.st_mtime_ns, st.st_size)
+
 
+def load_cache(cache_path: str) -> dict:
+    """Load the extraction cache saved by a previous run.
+    Returns an empty cache if it is missing, unreadable or from another CACHE_VERSION."""
+    try:
+        with open(cache_path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data["entries"]
 
-def compare_single(minipdf_path: str, reference_path: str, report_images_dir: str, name: str) -> dict:
-    """Compare a single pair of PDFs and return a detailed result."""
+
+def save_cache(cache: dict, cache_path: str):
+    """Persist the extraction cache for the next run."""
+    with open(cache_path, "wb") as f:
+        pickle.dump({"version": CACHE_VERSION, "entries": cache}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _sha256(path: str) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def _identical_result(result: dict, pdf_path: str, key: tuple, save_images: bool,
+                      max_pages_cap: int | None, cache: dict | None) -> dict:
+    """Fill in a perfect result for two byte-identical PDFs without rendering.
+    Page scores are capped at max_pages_cap like a rendered comparison."""
+    pages = "?"
+    if HAS_FITZ:
+        info = cache.get(key) if cache is not None else None
+        if info is None:
+            with fitz.open(pdf_path) as doc:
+                # A pages-only entry; compare_single extracts text if it ever needs it
+                info = {"pages": doc.page_count}
+        pages = info["pages"]
+        # Record the entry so main() carries it into the next run's cache
+        if cache is not None:
+            cache[key] = info
+
+    result["minipdf_pages"] = pages
+    result["reference_pages"] = pages
+    result["text_similarity"] = 1.0
+    result["flat_text_similarity"] = 1.0
+    result["text_diff"] = "(identical)"
+    if HAS_FITZ:
+        scored = min(pages, max_pages_cap) if max_pages_cap else pages
+        result["visual_scores"] = [1.0] * scored
+        result["visual_avg"] = 1.0 if scored else 0.0
+        if pages > scored:
+            result["unscored_pages"] = pages - scored
+        if save_images:
+            result["diff_images"] = []
+    result["overall_score"] = 1.0
+    return result
+
+
+def compare_single(minipdf_path: str, reference_path: str, report_images_dir: str, name: str,
+                   save_images: bool = False, score_dpi: int = 72, diff_threshold: float = 0.999,
+                   max_pages_cap: int | None = 20, image_format: str = "jpg",
+                   cache: dict | None = None, save_all_images: bool = False) -> dict:
+    """Compare a single pair of PDFs and return a detailed result.
+    Page images ("jpg" or "png") are only written to report_images_dir when
+    save_images is set, and only for pages whose visual score is below diff_threshold.
+    save_all_images writes every scored page instead, byte-identical pairs included.
+    Only the first max_pages_cap pages are visually scored (all if None or 0);
+    the rest are reported as unscored_pages and left out of visual_avg.
+    If a cache mapping is given, page counts, extracted text and visual scores
+    are looked up in / stored into it, keyed by (path, mtime, size)."""
+    st_m = _stat_file(minipdf_path)
+    st_r = _stat_file(reference_path)
     result = {
         "name": name,
-        "minipdf_exists": os.path.isfile(minipdf_path),
-        "reference_exists": os.path.isfile(reference_path),
+        "minipdf_exists": st_m is not None,
+        "reference_exists": st_r is not None,
     }
 
     if not result["minipdf_exists"]:
@@ -171,85 +342,131 @@ def compare_single(minipdf_path: str, reference_path: str, report_images_dir: st
         return result
 
     # File sizes
-    result["minipdf_size"] = os.path.getsize(minipdf_path)
-    result["reference_size"] = os.path.getsize(reference_path)
-
-    # Page counts
+    result["minipdf_size"] = st_m.st_size
+    result["reference_size"] = st_r.st_size
+    key_m = _file_key(minipdf_path, st_m)
+    key_r = _file_key(reference_path, st_r)
+
+    # Byte-identical files need no text extraction or rendering at all,
+    # unless the caller asked for every page image
+    save_images = save_images or save_all_images
+    if (not save_all_images
+            and result["minipdf_size"] == result["reference_size"]
+            and _sha256(minipdf_path) == _sha256(reference_path)):
+        return _identical_result(result, minipdf_path, key_m, save_images, max_pages_cap, cache)
+
+    # Page counts, text extraction and rendering share one open document per PDF.
+    # Results are memoized per file (and per pair for visual scores) in `cache`.
+    visual_scores = diff_images = None
     if HAS_FITZ:
-        doc_m = fitz.open(minipdf_path)
-        doc_r = fitz.open(reference_path)
-        result["minipdf_pages"] = len(doc_m)
-        result["reference_pages"] = len(doc_r)
-        doc_m.close()
-        doc_r.close()
+        if cache is None:
+            cache = {}
+        visual_key = ("visual", key_m, key_r, score_dpi, max_pages_cap)
+        # Entries written by _identical_result hold only the page count
+        info_m = cache.get(key_m)
+        info_r = cache.get(key_r)
+        if info_m is not None and "text" not in info_m:
+            info_m = None
+        if info_r is not None and "text" not in info_r:
+            info_r = None
+        if not save_images:
+            visual_scores = cache.get(visual_key)
+
+        if info_m is None or info_r is None or visual_scores is None:
+            with fitz.open(minipdf_path) as doc_m, fitz.open(reference_path) as doc_r:
+                n_m = doc_m.page_count
+                n_r = doc_r.page_count
+                try:
+                    if info_m is None:
+                        text, lines = _extract_text(doc_m)
+                        info_m = {"pages": n_m, "text": text, "lines": lines}
+                    if info_r is None:
+                        text, lines = _extract_text(doc_r)
+                        info_r = {"pages": n_r, "text": text, "lines": lines}
+                except Exception as e:
+                    text, lines = extract_text_fallback(minipdf_path)
+                    info_m = {"pages": n_m, "text": text, "lines": lines}
+                    text, lines = extract_text_fallback(reference_path)
+                    info_r = {"pages": n_r, "text": text, "lines": lines}
+                    result["text_extract_warning"] = str(e)
+
+                if visual_scores is None:
+                    if save_images:
+                        os.makedirs(report_images_dir, exist_ok=True)
+                    visual_scores, diff_images = _compare_pages(doc_m, doc_r, report_images_dir, name,
+                                                                save_images=save_images, score_dpi=score_dpi,
+                                                                diff_threshold=diff_threshold,
+                                                                max_pages_cap=max_pages_cap,
+                                                                image_format=image_format,
+                                                                save_all=save_all_images)
+
+        # Record every entry this comparison used (fallback text is not cached)
+        if "text_extract_warning" not in result:
+            cache[key_m] = info_m
+            cache[key_r] = info_r
+        cache[visual_key] = visual_scores
+
+        result["minipdf_pages"] = info_m["pages"]
+        result["reference_pages"] = info_r["pages"]
+        text_m, lines_m = info_m["text"], info_m["lines"]
+        text_r, lines_r = info_r["text"], info_r["lines"]
     else:
         result["minipdf_pages"] = "?"
         result["reference_pages"] = "?"
+        text_m, lines_m = extract_text_fallback(minipdf_path)
+        text_r, lines_r = extract_text_fallback(reference_path)
 
-    # Text extraction and comparison
-    if HAS_FITZ:
-        try:
-            text_m = extract_text_pymupdf(minipdf_path)
-            text_r = extract_text_pymupdf(reference_path)
-        except Exception as e:
-            text_m = extract_text_fallback(minipdf_path)
-            text_r = extract_text_fallback(reference_path)
-            result["text_extract_warning"] = str(e)
-    else:
-        text_m = extract_text_fallback(minipdf_path)
-        text_r = extract_text_fallback(reference_path)
-
-    # Flatten text for comparison
-    flat_m = "\n---PAGE---\n".join(text_m).strip()
-    flat_r = "\n---PAGE---\n".join(text_r).strip()
+    # Flatten words for comparison; the page-aware sequence marks page breaks
+    tokens_m = [tok for i, page in enumerate(text_m) for tok in ([PAGE_BREAK] if i else []) + page]
+    tokens_r = [tok for i, page in enumerate(text_r) for tok in ([PAGE_BREAK] if i else []) + page]
 
-    # Text similarity (SequenceMatcher) — page-aware
-    if len(flat_m) == 0 and len(flat_r) == 0:
-        # Both empty — treat as identical
+    if tokens_m == tokens_r:
+        # Same words on the same pages (includes both empty) — a linear compare suffices
         result["text_similarity"] = 1.0
-    else:
-        sm = difflib.SequenceMatcher(None, flat_m, flat_r)
-        result["text_similarity"] = round(sm.ratio(), 4)
-
-    # Also compute flat text similarity (ignoring page breaks)
-    # This is fairer when page break positions differ but content is the same
-    flat_m_no_page = flat_m.replace("\n---PAGE---\n", "\n")
-    flat_r_no_page = flat_r.replace("\n---PAGE---\n", "\n")
-    if len(flat_m_no_page) == 0 and len(flat_r_no_page) == 0:
         result["flat_text_similarity"] = 1.0
     else:
-        sm_flat = difflib.SequenceMatcher(None, flat_m_no_page, flat_r_no_page)
-        result["flat_text_similarity"] = round(sm_flat.ratio(), 4)
+        # Text similarity (token-level SequenceMatcher) — page-aware
+        result["text_similarity"] = round(_token_ratio(tokens_m, tokens_r), 4)
+
+        # Also compute flat text similarity (ignoring page breaks)
+        # This is fairer when page break positions differ but content is the same
+        flat_m = [tok for page in text_m for tok in page]
+        flat_r = [tok for page in text_r for tok in page]
+        if flat_m == flat_r:
+            result["flat_text_similarity"] = 1.0
+        else:
+            result["flat_text_similarity"] = round(_token_ratio(flat_m, flat_r), 4)
 
     # Use the higher of page-aware and flat text similarity
     result["text_similarity"] = max(result["text_similarity"], result["flat_text_similarity"])
 
-    # Unified diff
-    diff_lines = list(difflib.unified_diff(
-        flat_m.splitlines(keepends=True),
-        flat_r.splitlines(keepends=True),
-        fromfile=f"minipdf/{name}.pdf",
-        tofile=f"reference/{name}.pdf",
-        lineterm="",
-    ))
-    result["text_diff"] = "\n".join(diff_lines) if diff_lines else "(identical)"
+    # Unified diff of the text lines — skipped when there is nothing worth showing
+    if tokens_m == tokens_r or result["text_similarity"] >= 0.999:
+        result["text_diff"] = "(identical)"
+    else:
+        # Diff the whole documents, but the report truncates the diff anyway,
+        # so stop reading the generator after MAX_DIFF_LINES output lines
+        diff_iter = difflib.unified_diff(
+            [line for i, page in enumerate(lines_m) for line in ([PAGE_BREAK] if i else []) + page],
+            [line for i, page in enumerate(lines_r) for line in ([PAGE_BREAK] if i else []) + page],
+            fromfile=f"minipdf/{name}.pdf",
+            tofile=f"reference/{name}.pdf",
+            lineterm="",
+        )
+        diff_lines = list(itertools.islice(diff_iter, MAX_DIFF_LINES))
+        if next(diff_iter, None) is not None:
+            diff_lines.append(f"... (diff truncated after {MAX_DIFF_LINES} lines)")
+        result["text_diff"] = "\n".join(diff_lines) if diff_lines else "(identical)"
 
     # Visual comparison
-    visual_scores = []
-    if HAS_FITZ:
-        max_pages = max(result["minipdf_pages"], result["reference_pages"])
-        for p in range(max_pages):
-            pix_m = render_page_to_pixels(minipdf_path, p)
-            pix_r = render_page_to_pixels(reference_path, p)
-            score = pixel_diff_score(pix_m, pix_r)
-            visual_scores.append(round(score, 4))
-
+    if visual_scores is not None:
         result["visual_scores"] = visual_scores
         result["visual_avg"] = round(sum(visual_scores) / len(visual_scores), 4) if visual_scores else 0.0
-
-        # Save diff images
-        os.makedirs(report_images_dir, exist_ok=True)
-        result["diff_images"] = save_visual_diff(minipdf_path, reference_path, report_images_dir, name)
+        unscored = max(result["minipdf_pages"], result["reference_pages"]) - len(visual_scores)
+        if unscored > 0:
+            result["unscored_pages"] = unscored
+        if save_images:
+            result["diff_images"] = diff_images
 
     # Overall score: weighted average (text 40%, visual 40%, page-count match 20%)
     page_score = 1.0 if result.get("minipdf_pages") == result.get("reference_pages") else 0.5
@@ -261,88 +478,111 @@ def compare_single(minipdf_path: str, reference_path: str, report_images_dir: st
     return result
 
 
+_worker_cache: dict = {}
+
+
+def _init_worker(cache: dict):
+    """ProcessPoolExecutor initializer: hand each worker the loaded cache."""
+    global _worker_cache
+    _worker_cache = cache
+
+
+def _compare_job(job: dict) -> tuple[dict, dict]:
+    """ProcessPoolExecutor entry point: call compare_single with the job's kwargs.
+    Returns the result and the cache entries the comparison used."""
+    cache = ChainMap({}, _worker_cache)
+    result = compare_single(**job, cache=cache)
+    return result, cache.maps[0]
+
+
 def generate_report(results: list[dict], report_dir: str):
     """Generate a markdown + JSON comparison report."""
     # JSON dump
     json_path = os.path.join(report_dir, "comparison_report.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+    with open(json_path, "wb") as f:
+        f.write(_dumps(results))
 
     # Markdown report
     md_path = os.path.join(report_dir, "comparison_report.md")
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write("# MiniPdf vs Reference PDF Comparison Report\n\n")
-        f.write(f"Generated: {datetime.now().isoformat()}\n\n")
-
-        # Summary table
-        f.write("## Summary\n\n")
-        f.write("| # | Test Case | Text Sim | Visual Avg | Pages (M/R) | Overall |\n")
-        f.write("|---|-----------|----------|------------|-------------|--------|\n")
-
-        for i, r in enumerate(results, 1):
-            name = r["name"]
-            text_sim = r.get("text_similarity", "N/A")
-            vis_avg = r.get("visual_avg", "N/A")
-            mp = r.get("minipdf_pages", "?")
-            rp = r.get("reference_pages", "?")
-            overall = r.get("overall_score", "N/A")
-
-            # Color coding via emoji
-            if isinstance(overall, (int, float)):
-                if overall >= 0.9:
-                    emoji = "🟢"
-                elif overall >= 0.7:
-                    emoji = "🟡"
-                else:
-                    emoji = "🔴"
+    parts = []
+    append = parts.append
+    append("# MiniPdf vs Reference PDF Comparison Report\n\n")
+    append(f"Generated: {datetime.now().isoformat()}\n\n")
+
+    # Summary table
+    append("## Summary\n\n")
+    append("| # | Test Case | Text Sim | Visual Avg | Pages (M/R) | Overall |\n")
+    append("|---|-----------|----------|------------|-------------|--------|\n")
+
+    for i, r in enumerate(results, 1):
+        name = r["name"]
+        text_sim = r.get("text_similarity", "N/A")
+        vis_avg = r.get("visual_avg", "N/A")
+        mp = r.get("minipdf_pages", "?")
+        rp = r.get("reference_pages", "?")
+        overall = r.get("overall_score", "N/A")
+
+        # Color coding via emoji
+        if isinstance(overall, (int, float)):
+            if overall >= 0.9:
+                emoji = "🟢"
+            elif overall >= 0.7:
+                emoji = "🟡"
             else:
-                emoji = "⚪"
-
-            f.write(f"| {i} | {emoji} {name} | {text_sim} | {vis_avg} | {mp}/{rp} | **{overall}** |\n")
-
-        avg_overall = sum(r.get("overall_score", 0) for r in results) / len(results) if results else 0
-        f.write(f"\n**Average Overall Score: {avg_overall:.4f}**\n\n")
-
-        # Detailed sections
-        f.write("## Detailed Results\n\n")
-        for r in results:
-            name = r["name"]
-            f.write(f"### {name}\n\n")
-
-            if "error" in r:
-                f.write(f"**Error:** {r['error']}\n\n")
-                continue
-
-            f.write(f"- **Text Similarity:** {r.get('text_similarity', 'N/A')}\n")
-            f.write(f"- **Visual Average:** {r.get('visual_avg', 'N/A')}\n")
-            f.write(f"- **Overall Score:** {r.get('overall_score', 'N/A')}\n")
-            f.write(f"- **Pages:** MiniPdf={r.get('minipdf_pages', '?')}, Reference={r.get('reference_pages', '?')}\n")
-            f.write(f"- **File Size:** MiniPdf={r.get('minipdf_size', '?')} bytes, Reference={r.get('reference_size', '?')} bytes\n\n")
-
-            diff = r.get("text_diff", "")
-            if diff and diff != "(identical)":
-                f.write("<details><summary>Text Diff</summary>\n\n```diff\n")
-                # Truncate very long diffs
-                if len(diff) > 3000:
-                    f.write(diff[:3000])
-                    f.write(f"\n... ({len(diff) - 3000} more characters)\n")
-                else:
-                    f.write(diff)
-                f.write("\n```\n</details>\n\n")
+                emoji = "🔴"
+        else:
+            emoji = "⚪"
+
+        append(f"| {i} | {emoji} {name} | {text_sim} | {vis_avg} | {mp}/{rp} | **{overall}** |\n")
+
+    avg_overall = sum(r.get("overall_score", 0) for r in results) / len(results) if results else 0
+    append(f"\n**Average Overall Score: {avg_overall:.4f}**\n\n")
+
+    # Detailed sections
+    append("## Detailed Results\n\n")
+    for r in results:
+        name = r["name"]
+        append(f"### {name}\n\n")
+
+        if "error" in r:
+            append(f"**Error:** {r['error']}\n\n")
+            continue
+
+        append(f"- **Text Similarity:** {r.get('text_similarity', 'N/A')}\n")
+        append(f"- **Visual Average:** {r.get('visual_avg', 'N/A')}\n")
+        append(f"- **Overall Score:** {r.get('overall_score', 'N/A')}\n")
+        append(f"- **Pages:** MiniPdf={r.get('minipdf_pages', '?')}, Reference={r.get('reference_pages', '?')}\n")
+        if r.get("unscored_pages"):
+            append(f"- **Unscored Pages:** {r['unscored_pages']} (beyond --max-pages, not in Visual Average)\n")
+        append(f"- **File Size:** MiniPdf={r.get('minipdf_size', '?')} bytes, Reference={r.get('reference_size', '?')} bytes\n\n")
+
+        diff = r.get("text_diff", "")
+        if diff and diff != "(identical)":
+            append("<details><summary>Text Diff</summary>\n\n```diff\n")
+            # Truncate very long diffs
+            if len(diff) > 3000:
+                append(diff[:3000])
+                append(f"\n... ({len(diff) - 3000} more characters)\n")
             else:
-                f.write("Text content: ✅ Identical\n\n")
-
-        # Improvement suggestions
-        f.write("## Improvement Suggestions\n\n")
-        low_scores = [(r["name"], r.get("overall_score", 0)) for r in results if r.get("overall_score", 1) < 0.8]
-        if low_scores:
-            low_scores.sort(key=lambda x: x[1])
-            f.write("The following test cases scored below 0.8 and need attention:\n\n")
-            for name, score in low_scores:
-                f.write(f"1. **{name}** (score: {score})\n")
-            f.write("\nReview the text diffs and visual comparisons above to identify specific rendering issues.\n")
+                append(diff)
+            append("\n```\n</details>\n\n")
         else:
-            f.write("All test cases scored 0.8 or above. 🎉\n")
+            append("Text content: ✅ Identical\n\n")
+
+    # Improvement suggestions
+    append("## Improvement Suggestions\n\n")
+    low_scores = [(r["name"], r.get("overall_score", 0)) for r in results if r.get("overall_score", 1) < 0.8]
+    if low_scores:
+        low_scores.sort(key=lambda x: x[1])
+        append("The following test cases scored below 0.8 and need attention:\n\n")
+        for name, score in low_scores:
+            append(f"1. **{name}** (score: {score})\n")
+        append("\nReview the text diffs and visual comparisons above to identify specific rendering issues.\n")
+    else:
+        append("All test cases scored 0.8 or above. 🎉\n")
+
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
     print(f"\nReports saved:")
     print(f"  Markdown: {md_path}")
@@ -357,7 +597,25 @@ def main():
                         help="Directory containing reference PDFs (from LibreOffice)")
     parser.add_argument("--report-dir", default="reports",
                         help="Output directory for comparison reports")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Number of worker processes comparing PDF pairs in parallel "
+                             "(default: the executor's choice, based on the CPU count)")
+    parser.add_argument("--save-diff-images", action="store_true",
+                        help="Render pages at 150 DPI and save them as images under <report-dir>/images")
+    parser.add_argument("--image-format", choices=["jpg", "png"], default="jpg",
+                        help="Format of the saved page images (jpg is much faster to encode)")
+    parser.add_argument("--save-all-images", action="store_true",
+                        help="Like --save-diff-images, but save every page, including matching "
+                             "pages and byte-identical PDFs")
+    parser.add_argument("--diff-threshold", type=float, default=0.999,
+                        help="Pages with a visual score at or above this (0-1) are not saved as images")
+    parser.add_argument("--max-pages", type=int, default=20,
+                        help="Visually compare at most this many pages per PDF (0 = all)")
     args = parser.parse_args()
+    if args.max_pages < 0:
+        parser.error("--max-pages must be 0 (all pages) or a positive number")
+    if not 0.0 <= args.diff_threshold <= 1.0:
+        parser.error("--diff-threshold must be between 0 and 1")
 
     minipdf_dir = os.path.abspath(args.minipdf_dir)
     reference_dir = os.path.abspath(args.reference_dir)
@@ -375,8 +633,8 @@ def main():
     names = set()
     for d in [minipdf_dir, reference_dir]:
         if os.path.isdir(d):
-            for f in Path(d).glob("*.pdf"):
-                names.add(f.stem)
+            with os.scandir(d) as entries:
+                names.update(e.name[:-4] for e in entries if e.name.endswith(".pdf") and e.is_file())
 
     if not names:
         print("No PDF files found in either directory.")
@@ -386,15 +644,39 @@ def main():
         print("  3. python generate_reference_pdfs.py      (generate reference PDFs)")
         sys.exit(1)
 
+    # Each pair is independent; rendering holds the GIL, so use processes
+    jobs = [
+        {
+            "minipdf_path": os.path.join(minipdf_dir, f"{name}.pdf"),
+            "reference_path": os.path.join(reference_dir, f"{name}.pdf"),
+            "report_images_dir": images_dir,
+            "name": name,
+            "save_images": args.save_diff_images,
+            "save_all_images": args.save_all_images,
+            "diff_threshold": args.diff_threshold,
+            "max_pages_cap": args.max_pages,
+            "image_format": args.image_format,
+        }
+        for name in sorted(names)
+    ]
+    # Reruns on unchanged PDFs reuse extracted text and visual scores
+    cache_path = os.path.join(report_dir, ".cache.pkl")
+    cache = load_cache(cache_path)
+    new_cache = {}
     results = []
-    for name in sorted(names):
-        mp = os.path.join(minipdf_dir, f"{name}.pdf")
-        rp = os.path.join(reference_dir, f"{name}.pdf")
-        print(f"Comparing: {name} ...", end=" ")
-        result = compare_single(mp, rp, images_dir, name)
-        score = result.get("overall_score", "N/A")
-        print(f"score={score}")
-        results.append(result)
+    max_workers = args.jobs
+    if max_workers is not None:
+        max_workers = max(1, max_workers)
+        if sys.platform == "win32":
+            max_workers = min(61, max_workers)  # ProcessPoolExecutor's limit on Windows
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker, initargs=(cache,)) as ex:
+        for result, used in ex.map(_compare_job, jobs):
+            score = result.get("overall_score", "N/A")
+            print(f"Comparing: {result['name']} ... score={score}")
+            results.append(result)
+            new_cache.update(used)
+    save_cache(new_cache, cache_path)
 
     generate_report(results, report_dir)
 
@@ -9,7 +9,7 @@ Prerequisites:
        - Linux:  /usr/bin/soffice
 
 Usage:
-    python generate_reference_pdfs.py [--xlsx-dir ../MiniPdf.Scripts/output] [--pdf-dir ./reference_pdfs]
+    python generate_reference_pdfs.py [--xlsx-dir ../MiniPdf.Scripts/output] [--pdf-dir ./reference_pdfs] [--jobs N]
 
 This converts every .xlsx in the input directory to PDF using LibreOffice,
 producing the "ground truth" reference that MiniPdf output is compared against.
@@ -21,6 +21,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -51,30 +52,35 @@ def find_libreoffice() -> str:
     sys.exit(1)
 
 
+def run_soffice(soffice: str, xlsx_paths: list[str], output_dir: str, timeout: int) -> subprocess.CompletedProcess:
+    """Run one headless LibreOffice process converting the given files to PDF."""
+    # Use a unique user profile to avoid lock conflicts
+    with tempfile.TemporaryDirectory() as tmp_profile:
+        cmd = [
+            soffice,
+            "--headless",
+            "--norestore",
+            f"-env:UserInstallation=file:///{tmp_profile.replace(os.sep, '/')}",
+            "--convert-to", "pdf",
+            "--outdir", output_dir,
+            *xlsx_paths,
+        ]
+        return subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
+
 def convert_xlsx_to_pdf(soffice: str, xlsx_path: str, output_dir: str) -> bool:
     """Convert a single .xlsx to PDF via LibreOffice."""
     try:
-        # Use a unique user profile to avoid lock conflicts
-        with tempfile.TemporaryDirectory() as tmp_profile:
-            cmd = [
-                soffice,
-                "--headless",
-                "--norestore",
-                f"-env:UserInstallation=file:///{tmp_profile.replace(os.sep, '/')}",
-                "--convert-to", "pdf",
-                "--outdir", output_dir,
-                xlsx_path,
-            ]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120,
-            )
-            if result.returncode != 0:
-                print(f"  ERR {Path(xlsx_path).name}: {result.stderr.strip()}")
-                return False
-            return True
+        result = run_soffice(soffice, [xlsx_path], output_dir, timeout=120)
+        if result.returncode != 0:
+            print(f"  ERR {Path(xlsx_path).name}: {result.stderr.strip()}")
+            return False
+        return True
     except subprocess.TimeoutExpired:
         print(f"  TIMEOUT {Path(xlsx_path).name}")
         return False
@@ -83,12 +89,31 @@ def convert_xlsx_to_pdf(soffice: str, xlsx_path: str, output_dir: str) -> bool:
         return False
 
 
+def convert_batch(soffice: str, xlsx_paths: list[str], output_dir: str) -> bool:
+    """Convert many .xlsx files in a single LibreOffice invocation,
+    paying the soffice startup cost once instead of once per file."""
+    try:
+        result = run_soffice(soffice, xlsx_paths, output_dir, timeout=60 + 10 * len(xlsx_paths))
+        if result.returncode != 0:
+            print(f"  ERR batch of {len(xlsx_paths)} files: {result.stderr.strip()}")
+            return False
+        return True
+    except subprocess.TimeoutExpired:
+        print(f"  TIMEOUT batch of {len(xlsx_paths)} files")
+        return False
+    except Exception as e:
+        print(f"  ERR batch of {len(xlsx_paths)} files: {e}")
+        return False
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate reference PDFs via LibreOffice")
     parser.add_argument("--xlsx-dir", default=os.path.join("..", "MiniPdf.Scripts", "output"),
                         help="Directory containing .xlsx files")
     parser.add_argument("--pdf-dir", default="reference_pdfs",
                         help="Output directory for reference PDFs")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of parallel LibreOffice processes (each converts a chunk of files)")
     args = parser.parse_args()
 
     xlsx_dir = os.path.abspath(args.xlsx_dir)
@@ -107,21 +132,40 @@ def main():
     print(f"Output: {pdf_dir}")
     print()
 
-    xlsx_files = sorted(Path(xlsx_dir).glob("*.xlsx"))
+    with os.scandir(xlsx_dir) as entries:
+        xlsx_files = sorted(Path(e.path) for e in entries if e.name.endswith(".xlsx") and e.is_file())
     if not xlsx_files:
         print("No .xlsx files found.")
         sys.exit(1)
 
+    # Convert into a scratch directory so a PDF found there was written in this
+    # run (soffice can exit 0 when one input of a batch fails), and so a failed
+    # run leaves the existing references in pdf_dir untouched
     passed = 0
     failed = 0
-    for xlsx in xlsx_files:
-        ok = convert_xlsx_to_pdf(soffice, str(xlsx), pdf_dir)
-        if ok:
+    with tempfile.TemporaryDirectory() as out_dir:
+        produced = {xlsx: os.path.join(out_dir, xlsx.stem + ".pdf") for xlsx in xlsx_files}
+
+        # Split into one chunk per LibreOffice process, each with its own profile dir
+        jobs = max(1, min(args.jobs, len(xlsx_files)))
+        chunks = [xlsx_files[i::jobs] for i in range(jobs)]
+        with ThreadPoolExecutor(max_workers=jobs) as ex:
+            list(ex.map(lambda chunk: convert_batch(soffice, [str(x) for x in chunk], out_dir), chunks))
+
+        # Fall back to one soffice process per file for anything a batch did not produce
+        for xlsx in xlsx_files:
+            if not os.path.isfile(produced[xlsx]):
+                convert_xlsx_to_pdf(soffice, str(xlsx), out_dir)
+
+        for xlsx in xlsx_files:
             pdf_name = xlsx.stem + ".pdf"
-            print(f"  OK  {pdf_name}")
-            passed += 1
-        else:
-            failed += 1
+            if os.path.isfile(produced[xlsx]):
+                shutil.move(produced[xlsx], os.path.join(pdf_dir, pdf_name))
+                print(f"  OK  {pdf_name}")
+                passed += 1
+            else:
+                print(f"  ERR {xlsx.name}: no PDF produced (keeping any previous reference)")
+                failed += 1
 
     print(f"\nDone! Passed: {passed}, Failed: {failed}, Total: {len(xlsx_files)}")
 
@@ -5,7 +5,7 @@ via MiniPdf and LibreOffice, compares the results, and produces a report.
 This is the single entry point for the full "self-evolution" pipeline.
 
 Prerequisites:
-    pip install openpyxl pymupdf
+    pip install openpyxl pymupdf numpy
     LibreOffice installed (for reference PDF generation)
     .NET 9 SDK (for MiniPdf)
 
@@ -86,7 +86,10 @@ def step_compare():
         [sys.executable, "compare_pdfs.py",
          "--minipdf-dir", str(MINIPDF_PDF_DIR.resolve()),
          "--reference-dir", str(REFERENCE_PDF_DIR.resolve()),
-         "--report-dir", str(REPORT_DIR.resolve())],
+         "--report-dir", str(REPORT_DIR.resolve()),
+         # The root README gallery embeds every case's page images, so save all
+         # pages, not only the ones that differ
+         "--save-all-images", "--image-format", "png"],
         cwd=str(SCRIPT_DIR),
     )
 
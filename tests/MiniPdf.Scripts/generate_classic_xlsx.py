@@ -3,364 +3,384 @@ Generate 30 classic .xlsx files for testing Excel-to-PDF conversion.
 Each file corresponds to a test case in ClassicExcelToPdfTests.cs.
 
 Usage:
-    pip install openpyxl
+    pip install openpyxl numpy
+    pip install lxml            # optional, speeds up openpyxl's write-only mode
     python generate_classic_xlsx.py
 
 Output directory: ./output/
 """
 
+import io
 import os
 import string
+from collections.abc import Iterable, Iterator
+
+import numpy as np
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import coordinate_to_tuple, get_column_letter
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 
 
-def ensure_output_dir():
+def ensure_output_dir() -> None:
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
-def save(wb: Workbook, filename: str):
+def write_output(filename: str, data: bytes) -> str:
+    """Write a finished file with one open/write/close instead of many small writes."""
     path = os.path.join(OUTPUT_DIR, filename)
-    wb.save(path)
-    print(f"  ✔ {filename}")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return filename
+
+
+def save(wb: Workbook, filename: str) -> str:
+    buf = io.BytesIO()
+    wb.save(buf)
+    return write_output(filename, buf.getvalue())
+
+
+def styled_cell(ws, value, font: Font) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    return cell
+
+
+def sparse_rows(cells: dict[str, object]) -> list[list]:
+    """Expand {"A1": value, ...} into whole rows padded with None."""
+    rows = []
+    for ref, value in cells.items():
+        r, c = coordinate_to_tuple(ref)
+        while len(rows) < r:
+            rows.append([])
+        row = rows[r - 1]
+        if len(row) < c:
+            row.extend([None] * (c - len(row)))
+        row[c - 1] = value
+    return rows
+
+
+def save_rows(filename: str, sheets: dict[str, Iterable[list]]) -> str:
+    """Write value-only sheets through a write-only openpyxl workbook.
+
+    Rows may come from a generator; each one is serialized as it is
+    appended, so only the current row is held in memory.
+    """
+    wb = Workbook(write_only=True)
+    for sheet_name, rows in sheets.items():
+        append = wb.create_sheet(sheet_name).append
+        for row in rows:
+            append(row)
+    return save(wb, filename)
 
 
 # ── 01. Basic table with headers ────────────────────────────────────────
-def classic01_basic_table_with_headers():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Name", "Age", "City"])
-    ws.append(["Alice", 30, "New York"])
-    ws.append(["Bob", 25, "London"])
-    ws.append(["Charlie", 35, "Tokyo"])
-    ws.append(["Diana", 28, "Paris"])
-    save(wb, "classic01_basic_table_with_headers.xlsx")
+def classic01_basic_table_with_headers() -> str:
+    rows = [
+        ["Name", "Age", "City"],
+        ["Alice", 30, "New York"],
+        ["Bob", 25, "London"],
+        ["Charlie", 35, "Tokyo"],
+        ["Diana", 28, "Paris"],
+    ]
+    return save_rows("classic01_basic_table_with_headers.xlsx", {"Sheet1": rows})
 
 
 # ── 02. Multiple worksheets ─────────────────────────────────────────────
-def classic02_multiple_worksheets():
-    wb = Workbook()
-    ws1 = wb.active
-    ws1.title = "Sales"
-    ws1.append(["Quarter", "Revenue"])
-    ws1.append(["Q1", 100])
-    ws1.append(["Q2", 200])
-    ws1.append(["Q3", 350])
-    ws1.append(["Q4", 480])
-
-    ws2 = wb.create_sheet("Costs")
-    ws2.append(["Category", "Amount"])
-    ws2.append(["Rent", 500])
-    ws2.append(["Salary", 3000])
-    ws2.append(["Utilities", 200])
-
-    ws3 = wb.create_sheet("Summary")
-    ws3.append(["Metric", "Value"])
-    ws3.append(["Total Revenue", 1130])
-    ws3.append(["Total Costs", 3700])
-    ws3.append(["Net", -2570])
-    save(wb, "classic02_multiple_worksheets.xlsx")
+def classic02_multiple_worksheets() -> str:
+    sales = [
+        ["Quarter", "Revenue"],
+        ["Q1", 100],
+        ["Q2", 200],
+        ["Q3", 350],
+        ["Q4", 480],
+    ]
+    costs = [
+        ["Category", "Amount"],
+        ["Rent", 500],
+        ["Salary", 3000],
+        ["Utilities", 200],
+    ]
+    summary = [
+        ["Metric", "Value"],
+        ["Total Revenue", 1130],
+        ["Total Costs", 3700],
+        ["Net", -2570],
+    ]
+    return save_rows("classic02_multiple_worksheets.xlsx",
+                     {"Sales": sales, "Costs": costs, "Summary": summary})
 
 
 # ── 03. Empty workbook (no data rows) ───────────────────────────────────
-def classic03_empty_workbook():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
+def classic03_empty_workbook() -> str:
     # No data at all
-    save(wb, "classic03_empty_workbook.xlsx")
+    return save_rows("classic03_empty_workbook.xlsx", {"Sheet1": []})
 
 
 # ── 04. Single cell ─────────────────────────────────────────────────────
-def classic04_single_cell():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws["A1"] = "Hello"
-    save(wb, "classic04_single_cell.xlsx")
+def classic04_single_cell() -> str:
+    return save_rows("classic04_single_cell.xlsx", {"Sheet1": [["Hello"]]})
 
 
 # ── 05. Wide table (26 columns A–Z) ─────────────────────────────────────
-def classic05_wide_table():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
+def classic05_wide_table() -> str:
     headers = list(string.ascii_uppercase)  # A-Z
-    ws.append(headers)
-    for row_idx in range(1, 6):
-        ws.append([f"{ch}{row_idx}" for ch in headers])
-    save(wb, "classic05_wide_table.xlsx")
+    letters = np.array(headers)
+    row_labels = np.arange(1, 6).astype(str)
+    grid = np.char.add(letters[None, :], row_labels[:, None])  # "{ch}{row_idx}"
+    rows = [headers] + grid.tolist()
+    return save_rows("classic05_wide_table.xlsx", {"Sheet1": rows})
 
 
 # ── 06. Tall table (200 rows → multi-page) ──────────────────────────────
-def classic06_tall_table():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Row#", "Value", "Description"])
-    for i in range(1, 201):
-        ws.append([f"Row{i}", f"Val{i}", f"This is the description for row number {i}"])
-    save(wb, "classic06_tall_table.xlsx")
+def classic06_tall_table() -> str:
+    def rows() -> Iterator[list]:
+        yield ["Row#", "Value", "Description"]
+        for i in range(1, 201):
+            n = str(i)
+            yield ["Row" + n, "Val" + n, "This is the description for row number " + n]
+    return save_rows("classic06_tall_table.xlsx", {"Sheet1": rows()})
 
 
 # ── 07. Numbers only ────────────────────────────────────────────────────
-def classic07_numbers_only():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append([1.0, 2.0, 3.0])
-    ws.append([4.0, 5.0, 6.0])
-    ws.append([7.0, 8.0, 9.0])
-    ws.append([10.0, 100.0, 1000.0])
-    save(wb, "classic07_numbers_only.xlsx")
+def classic07_numbers_only() -> str:
+    rows = [
+        [1.0, 2.0, 3.0],
+        [4.0, 5.0, 6.0],
+        [7.0, 8.0, 9.0],
+        [10.0, 100.0, 1000.0],
+    ]
+    return save_rows("classic07_numbers_only.xlsx", {"Sheet1": rows})
 
 
 # ── 08. Mixed text and numbers ──────────────────────────────────────────
-def classic08_mixed_text_and_numbers():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Item", "Amount"])
-    ws.append(["Item", 10.5])
-    ws.append(["Tax", 0.08])
-    ws.append(["Total", 10.58])
-    ws.append(["Discount", -1.5])
-    ws.append(["Final", 9.08])
-    save(wb, "classic08_mixed_text_and_numbers.xlsx")
+def classic08_mixed_text_and_numbers() -> str:
+    rows = [
+        ["Item", "Amount"],
+        ["Item", 10.5],
+        ["Tax", 0.08],
+        ["Total", 10.58],
+        ["Discount", -1.5],
+        ["Final", 9.08],
+    ]
+    return save_rows("classic08_mixed_text_and_numbers.xlsx", {"Sheet1": rows})
 
 
 # ── 09. Long text content ───────────────────────────────────────────────
-def classic09_long_text():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Long Text Column"])
-    ws.append(["X" * 500])
-    ws.append(["A" * 300 + " " + "B" * 200])
-    ws.append(["Short"])
-    ws.append(["Y" * 1000])
-    save(wb, "classic09_long_text.xlsx")
+def classic09_long_text() -> str:
+    rows = [
+        ["Long Text Column"],
+        ["X" * 500],
+        ["A" * 300 + " " + "B" * 200],
+        ["Short"],
+        ["Y" * 1000],
+    ]
+    return save_rows("classic09_long_text.xlsx", {"Sheet1": rows})
 
 
 # ── 10. Special XML characters ──────────────────────────────────────────
-def classic10_special_xml_characters():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Special Characters"])
-    ws.append(["A&B"])
-    ws.append(["<tag>"])
-    ws.append(['"quoted"'])
-    ws.append(["it's"])
-    ws.append(["Tom & Jerry < Batman > Superman"])
-    ws.append(['He said "hello" & she replied \'hi\''])
-    save(wb, "classic10_special_xml_characters.xlsx")
+def classic10_special_xml_characters() -> str:
+    rows = [
+        ["Special Characters"],
+        ["A&B"],
+        ["<tag>"],
+        ['"quoted"'],
+        ["it's"],
+        ["Tom & Jerry < Batman > Superman"],
+        ['He said "hello" & she replied \'hi\''],
+    ]
+    return save_rows("classic10_special_xml_characters.xlsx", {"Sheet1": rows})
 
 
 # ── 11. Sparse rows (gaps between data rows) ────────────────────────────
-def classic11_sparse_rows():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.cell(row=1, column=1, value="First")
-    ws.cell(row=5, column=1, value="Fifth")
-    ws.cell(row=10, column=1, value="Tenth")
-    ws.cell(row=20, column=1, value="Twentieth")
-    ws.cell(row=50, column=1, value="Fiftieth")
-    save(wb, "classic11_sparse_rows.xlsx")
+def classic11_sparse_rows() -> str:
+    rows = sparse_rows({
+        "A1": "First",
+        "A5": "Fifth",
+        "A10": "Tenth",
+        "A20": "Twentieth",
+        "A50": "Fiftieth",
+    })
+    return save_rows("classic11_sparse_rows.xlsx", {"Sheet1": rows})
 
 
 # ── 12. Sparse columns (A, D filled; B, C empty) ───────────────────────
-def classic12_sparse_columns():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws["A1"] = "Left"
-    ws["D1"] = "Right"
-    ws["A2"] = "Data1"
-    ws["F2"] = "FarRight"
-    ws["A3"] = "Row3"
-    ws["J3"] = "VeryFar"
-    save(wb, "classic12_sparse_columns.xlsx")
+def classic12_sparse_columns() -> str:
+    rows = sparse_rows({
+        "A1": "Left",
+        "D1": "Right",
+        "A2": "Data1",
+        "F2": "FarRight",
+        "A3": "Row3",
+        "J3": "VeryFar",
+    })
+    return save_rows("classic12_sparse_columns.xlsx", {"Sheet1": rows})
 
 
 # ── 13. Date-like strings ───────────────────────────────────────────────
-def classic13_date_strings():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Date", "Event"])
-    ws.append(["2025-01-15", "Launch"])
-    ws.append(["2025-06-30", "Release"])
-    ws.append(["2025-12-25", "Holiday"])
-    ws.append(["2026-01-01", "New Year"])
-    ws.append(["2026-02-23", "Today"])
-    save(wb, "classic13_date_strings.xlsx")
+def classic13_date_strings() -> str:
+    rows = [
+        ["Date", "Event"],
+        ["2025-01-15", "Launch"],
+        ["2025-06-30", "Release"],
+        ["2025-12-25", "Holiday"],
+        ["2026-01-01", "New Year"],
+        ["2026-02-23", "Today"],
+    ]
+    return save_rows("classic13_date_strings.xlsx", {"Sheet1": rows})
 
 
 # ── 14. Decimal numbers ─────────────────────────────────────────────────
-def classic14_decimal_numbers():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Constant", "Value"])
-    ws.append(["Pi", 3.14159])
-    ws.append(["e", 2.71828])
-    ws.append(["Sqrt(2)", 1.41421])
-    ws.append(["Phi", 1.61803])
-    ws.append(["Ln(2)", 0.69315])
-    save(wb, "classic14_decimal_numbers.xlsx")
+def classic14_decimal_numbers() -> str:
+    rows = [
+        ["Constant", "Value"],
+        ["Pi", 3.14159],
+        ["e", 2.71828],
+        ["Sqrt(2)", 1.41421],
+        ["Phi", 1.61803],
+        ["Ln(2)", 0.69315],
+    ]
+    return save_rows("classic14_decimal_numbers.xlsx", {"Sheet1": rows})
 
 
 # ── 15. Negative numbers ────────────────────────────────────────────────
-def classic15_negative_numbers():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Label", "Value"])
-    ws.append(["Loss", -100.0])
-    ws.append(["Small Loss", -0.5])
-    ws.append(["Zero", 0.0])
-    ws.append(["Gain", 50.0])
-    ws.append(["Big Loss", -99999.99])
-    ws.append(["Tiny", -0.001])
-    save(wb, "classic15_negative_numbers.xlsx")
+def classic15_negative_numbers() -> str:
+    rows = [
+        ["Label", "Value"],
+        ["Loss", -100.0],
+        ["Small Loss", -0.5],
+        ["Zero", 0.0],
+        ["Gain", 50.0],
+        ["Big Loss", -99999.99],
+        ["Tiny", -0.001],
+    ]
+    return save_rows("classic15_negative_numbers.xlsx", {"Sheet1": rows})
 
 
 # ── 16. Percentage-like strings ──────────────────────────────────────────
-def classic16_percentage_strings():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Metric", "Rate"])
-    ws.append(["Conversion", "12.5%"])
-    ws.append(["Bounce", "45.3%"])
-    ws.append(["Retention", "88.7%"])
-    ws.append(["Churn", "3.2%"])
-    ws.append(["Growth", "156.0%"])
-    save(wb, "classic16_percentage_strings.xlsx")
+def classic16_percentage_strings() -> str:
+    rows = [
+        ["Metric", "Rate"],
+        ["Conversion", "12.5%"],
+        ["Bounce", "45.3%"],
+        ["Retention", "88.7%"],
+        ["Churn", "3.2%"],
+        ["Growth", "156.0%"],
+    ]
+    return save_rows("classic16_percentage_strings.xlsx", {"Sheet1": rows})
 
 
 # ── 17. Currency-like strings ───────────────────────────────────────────
-def classic17_currency_strings():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Item", "Price"])
-    ws.append(["Widget", "$19.99"])
-    ws.append(["Gadget", "$149.00"])
-    ws.append(["Premium", "$1,299.99"])
-    ws.append(["Budget", "$4.50"])
-    ws.append(["Euro Item", "€49.99"])
-    ws.append(["Yen Item", "¥5000"])
-    save(wb, "classic17_currency_strings.xlsx")
+def classic17_currency_strings() -> str:
+    rows = [
+        ["Item", "Price"],
+        ["Widget", "$19.99"],
+        ["Gadget", "$149.00"],
+        ["Premium", "$1,299.99"],
+        ["Budget", "$4.50"],
+        ["Euro Item", "€49.99"],
+        ["Yen Item", "¥5000"],
+    ]
+    return save_rows("classic17_currency_strings.xlsx", {"Sheet1": rows})
 
 
 # ── 18. Large dataset (1000 rows × 10 cols) ─────────────────────────────
-def classic18_large_dataset():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
+def classic18_large_dataset() -> str:
     headers = [f"Col{c}" for c in range(10)]
-    ws.append(headers)
-    for r in range(1000):
-        ws.append([f"R{r}C{c}" for c in range(10)])
-    save(wb, "classic18_large_dataset.xlsx")
+    r_labels = np.char.add("R", np.arange(1000).astype(str))
+    c_labels = np.char.add("C", np.arange(10).astype(str))
+    grid = np.char.add(r_labels[:, None], c_labels[None, :])  # "R{r}C{c}"
+    rows = [headers] + grid.tolist()
+    return save_rows("classic18_large_dataset.xlsx", {"Sheet1": rows})
 
 
 # ── 19. Single column list ──────────────────────────────────────────────
-def classic19_single_column_list():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Items"])
-    for i in range(1, 21):
-        ws.append([f"Item {i}"])
-    save(wb, "classic19_single_column_list.xlsx")
+def classic19_single_column_list() -> str:
+    def rows() -> Iterator[list]:
+        yield ["Items"]
+        for i in range(1, 21):
+            yield [f"Item {i}"]
+    return save_rows("classic19_single_column_list.xlsx", {"Sheet1": rows()})
 
 
 # ── 20. All empty cells ─────────────────────────────────────────────────
-def classic20_all_empty_cells():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["", "", ""])
-    ws.append(["", "", ""])
-    ws.append(["", "", ""])
-    save(wb, "classic20_all_empty_cells.xlsx")
+def classic20_all_empty_cells() -> str:
+    rows = [
+        ["", "", ""],
+        ["", "", ""],
+        ["", "", ""],
+    ]
+    return save_rows("classic20_all_empty_cells.xlsx", {"Sheet1": rows})
 
 
 # ── 21. Header only (no data rows) ──────────────────────────────────────
-def classic21_header_only():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Col1", "Col2", "Col3", "Col4", "Col5"])
-    save(wb, "classic21_header_only.xlsx")
+def classic21_header_only() -> str:
+    rows = [["Col1", "Col2", "Col3", "Col4", "Col5"]]
+    return save_rows("classic21_header_only.xlsx", {"Sheet1": rows})
 
 
 # ── 22. Very long sheet name ────────────────────────────────────────────
-def classic22_long_sheet_name():
-    wb = Workbook()
+def classic22_long_sheet_name() -> str:
+    rows = [
+        ["Data", "Value"],
+        ["Row1", 100],
+        ["Row2", 200],
+    ]
     # Excel sheet name max is 31 characters
-    ws = wb.active
-    ws.title = "VeryLongSheetNameThatIsMaxLen"
-    ws.append(["Data", "Value"])
-    ws.append(["Row1", 100])
-    ws.append(["Row2", 200])
-    save(wb, "classic22_long_sheet_name.xlsx")
+    return save_rows("classic22_long_sheet_name.xlsx",
+                     {"VeryLongSheetNameThatIsMaxLen": rows})
 
 
 # ── 23. Unicode / CJK text ──────────────────────────────────────────────
-def classic23_unicode_text():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Language", "Greeting", "Extra"])
-    ws.append(["English", "Hello", "World"])
-    ws.append(["Chinese", "你好", "世界"])
-    ws.append(["Japanese", "こんにちは", "世界"])
-    ws.append(["Korean", "안녕하세요", "세계"])
-    ws.append(["Arabic", "مرحبا", "العالم"])
-    ws.append(["Emoji", "😀🎉", "✅❌"])
-    save(wb, "classic23_unicode_text.xlsx")
+def classic23_unicode_text() -> str:
+    rows = [
+        ["Language", "Greeting", "Extra"],
+        ["English", "Hello", "World"],
+        ["Chinese", "你好", "世界"],
+        ["Japanese", "こんにちは", "世界"],
+        ["Korean", "안녕하세요", "세계"],
+        ["Arabic", "مرحبا", "العالم"],
+        ["Emoji", "😀🎉", "✅❌"],
+    ]
+    return save_rows("classic23_unicode_text.xlsx", {"Sheet1": rows})
 
 
 # ── 24. Red text (colored) ──────────────────────────────────────────────
-def classic24_red_text():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
+def classic24_red_text() -> str:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
     red_font = Font(color="FF0000", size=11)
     normal_font = Font(size=11)
+    warning_font = Font(color="FFA500", size=11)
 
     ws.append(["Status", "Message"])
-    cell_a = ws.cell(row=2, column=1, value="Error")
-    cell_a.font = red_font
-    cell_b = ws.cell(row=2, column=2, value="Something went wrong")
-    cell_b.font = red_font
-
-    cell_a2 = ws.cell(row=3, column=1, value="OK")
-    cell_a2.font = normal_font
-    cell_b2 = ws.cell(row=3, column=2, value="All systems operational")
-    cell_b2.font = normal_font
-
-    cell_a3 = ws.cell(row=4, column=1, value="Warning")
-    cell_a3.font = Font(color="FFA500", size=11)
-    cell_b3 = ws.cell(row=4, column=2, value="Check disk space")
-    cell_b3.font = Font(color="FFA500", size=11)
-    save(wb, "classic24_red_text.xlsx")
+    ws.append([
+        styled_cell(ws, "Error", red_font),
+        styled_cell(ws, "Something went wrong", red_font),
+    ])
+    ws.append([
+        styled_cell(ws, "OK", normal_font),
+        styled_cell(ws, "All systems operational", normal_font),
+    ])
+    ws.append([
+        styled_cell(ws, "Warning", warning_font),
+        styled_cell(ws, "Check disk space", warning_font),
+    ])
+    return save(wb, "classic24_red_text.xlsx")
 
 
 # ── 25. Multiple colors ─────────────────────────────────────────────────
-def classic25_multiple_colors():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
+def classic25_multiple_colors() -> str:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
     colors = [
         ("Red", "FF0000"),
         ("Green", "00FF00"),
@@ -371,85 +391,78 @@ def classic25_multiple_colors():
         ("Orange", "FFA500"),
         ("Purple", "800080"),
     ]
-    ws.append(["Color Name", "Sample Text"])
+    fonts = {color_hex: Font(color=color_hex, size=11) for _, color_hex in colors}
+    append = ws.append
+    append(["Color Name", "Sample Text"])
     for name, color_hex in colors:
-        row = ws.max_row + 1
-        cell_a = ws.cell(row=row, column=1, value=name)
-        cell_a.font = Font(color=color_hex, size=11)
-        cell_b = ws.cell(row=row, column=2, value=f"This is {name.lower()} text")
-        cell_b.font = Font(color=color_hex, size=11)
-    save(wb, "classic25_multiple_colors.xlsx")
+        font = fonts[color_hex]
+        append([
+            styled_cell(ws, name, font),
+            styled_cell(ws, f"This is {name.lower()} text", font),
+        ])
+    return save(wb, "classic25_multiple_colors.xlsx")
 
 
 # ── 26. Inline strings ──────────────────────────────────────────────────
-def classic26_inline_strings():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Inline1", "Inline2", "Inline3"])
-    ws.append(["ValueA", "ValueB", "ValueC"])
-    ws.append(["Test1", "Test2", "Test3"])
-    save(wb, "classic26_inline_strings.xlsx")
+def classic26_inline_strings() -> str:
+    rows = [
+        ["Inline1", "Inline2", "Inline3"],
+        ["ValueA", "ValueB", "ValueC"],
+        ["Test1", "Test2", "Test3"],
+    ]
+    return save_rows("classic26_inline_strings.xlsx", {"Sheet1": rows})
 
 
 # ── 27. Single row (horizontal data) ────────────────────────────────────
-def classic27_single_row():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
-    save(wb, "classic27_single_row.xlsx")
+def classic27_single_row() -> str:
+    rows = [["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]]
+    return save_rows("classic27_single_row.xlsx", {"Sheet1": rows})
 
 
 # ── 28. Duplicate values ────────────────────────────────────────────────
-def classic28_duplicate_values():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["Yes", "No", "Yes", "No"])
-    ws.append(["No", "Yes", "No", "Yes"])
-    ws.append(["Yes", "Yes", "Yes", "Yes"])
-    ws.append(["No", "No", "No", "No"])
-    ws.append(["Yes", "No", "Yes", "No"])
-    save(wb, "classic28_duplicate_values.xlsx")
+def classic28_duplicate_values() -> str:
+    rows = [
+        ["Yes", "No", "Yes", "No"],
+        ["No", "Yes", "No", "Yes"],
+        ["Yes", "Yes", "Yes", "Yes"],
+        ["No", "No", "No", "No"],
+        ["Yes", "No", "Yes", "No"],
+    ]
+    return save_rows("classic28_duplicate_values.xlsx", {"Sheet1": rows})
 
 
 # ── 29. Formula-result values ────────────────────────────────────────────
-def classic29_formula_results():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(["A", "B", "Sum", "Product"])
-    ws.append([10, 20, "=A2+B2", "=A2*B2"])
-    ws.append([5, 15, "=A3+B3", "=A3*B3"])
-    ws.append([100, 200, "=A4+B4", "=A4*B4"])
-    ws.append(["", "", "=SUM(C2:C4)", "=SUM(D2:D4)"])
-    save(wb, "classic29_formula_results.xlsx")
+def classic29_formula_results() -> str:
+    rows = [
+        ["A", "B", "Sum", "Product"],
+        [10, 20, "=A2+B2", "=A2*B2"],
+        [5, 15, "=A3+B3", "=A3*B3"],
+        [100, 200, "=A4+B4", "=A4*B4"],
+        ["", "", "=SUM(C2:C4)", "=SUM(D2:D4)"],
+    ]
+    return save_rows("classic29_formula_results.xlsx", {"Sheet1": rows})
 
 
 # ── 30. Mixed empty and filled sheets ───────────────────────────────────
-def classic30_mixed_empty_and_filled_sheets():
-    wb = Workbook()
-    ws1 = wb.active
-    ws1.title = "Empty"
-    # No data in first sheet
-
-    ws2 = wb.create_sheet("Data")
-    ws2.append(["Hello", "World"])
-    ws2.append(["Foo", "Bar"])
-    ws2.append(["Baz", "Qux"])
-
-    ws3 = wb.create_sheet("AlsoEmpty")
-    # No data in third sheet
-
-    ws4 = wb.create_sheet("MoreData")
-    ws4.append(["Column1", "Column2", "Column3"])
-    ws4.append([1, 2, 3])
-    save(wb, "classic30_mixed_empty_and_filled_sheets.xlsx")
+def classic30_mixed_empty_and_filled_sheets() -> str:
+    sheets = {
+        "Empty": [],  # No data in first sheet
+        "Data": [
+            ["Hello", "World"],
+            ["Foo", "Bar"],
+            ["Baz", "Qux"],
+        ],
+        "AlsoEmpty": [],  # No data in third sheet
+        "MoreData": [
+            ["Column1", "Column2", "Column3"],
+            [1, 2, 3],
+        ],
+    }
+    return save_rows("classic30_mixed_empty_and_filled_sheets.xlsx", sheets)
 
 
 # ── Main ─────────────────────────────────────────────────────────────────
-def main():
+def main() -> None:
     ensure_output_dir()
     print(f"Generating 30 classic .xlsx files in: {OUTPUT_DIR}\n")
 
@@ -487,7 +500,7 @@ def main():
     ]
 
     for gen in generators:
-        gen()
+        print(f"  ✔ {gen()}")
 
     print(f"\nDone! {len(generators)} files generated.")
 